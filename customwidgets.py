@@ -9,9 +9,9 @@ from __future__ import annotations
 from kivy.uix.settings import *
 from kivy.uix.settings import InterfaceWithSidebar
 from kivy.uix.settings import SettingSpacer
+from kivy.uix.anchorlayout import AnchorLayout
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.popup import Popup
 from kivy.uix.filechooser import FileChooserListView
 from kivy.uix.stencilview import StencilView
@@ -25,11 +25,13 @@ from kivy.properties import *
 from kivy.core.window import Window
 from kivy.graphics import *
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.lang import Builder
 from kivy.logger import Logger
 
-import os, sys, re
+import os
+from functools import partial
 from typing import TextIO, Union, Iterable, Callable, Any
 
 __all__ = ['InfoDialog', 'ColourChooser', 'ColourChooserPopup',
@@ -37,6 +39,10 @@ __all__ = ['InfoDialog', 'ColourChooser', 'ColourChooserPopup',
            'SaveFileDialog', 'OpenFileDialog', 'WrapLabel', 'BGLabel',
            'StencilBox', 'NumEntry', 'ContentDialog']
 
+# The `kv` language rules for the widgets defined here
+Builder.load_file(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               'customwidgets.kv'))
+
 
 class WrapLabel(Label):
     """A Label that prevents the text overflowing beyond its boundary.
@@ -44,10 +50,6 @@ class WrapLabel(Label):
     methods are defined here - it behaves as a regular `kivy.uix.label.Label`
     otherwise."""
     pass
-Builder.load_string("""
-<WrapLabel>:
-    text_size: self.width, None
-""", filename='cw_WrapLabel.kv')
 
 class BGLabel(Label):
     r"""A label with a custom RGBA background colour.
@@ -56,38 +58,79 @@ class BGLabel(Label):
     :\**kwargs: Any other keyword args, passed to the `kivy.uix.label.Label` constructor.
 
     A coloured rectangle is drawn covering the Label's size (*not its `text_size`*,
-    also use WrapLabel to constrain the text to this size !) in the `canvas.before`
-    statement using the `kv` language.
-    No other methods are defined here.
+    also use WrapLabel to constrain the text to this size !) in `canvas.before`.
+    The instructions are created once here, instead of from a `kv` rule for each
+    instance, and only their properties are updated when the label changes.
     """
     bgcolour = ListProperty([0,0,0,0])
 
     def __init__(self, **kwargs):
         self.bgcolour = kwargs.pop('bgcolour', [0,0,0,0])
         super(BGLabel, self).__init__(**kwargs)
-
-Builder.load_string("""
-<BGLabel>:
-    canvas.before:
-        Color:
-            rgba: root.bgcolour
-        Rectangle:
-            size: self.size
-            pos: self.pos
-""", filename='cw_BGLabel.kv')
+        with self.canvas.before:
+            self._bgcolor = Color(rgba=self.bgcolour)
+            self._bgrect = Rectangle(size=self.size, pos=self.pos)
+        self.fbind('bgcolour', self._updatebgcolour)
+        self.fbind('pos', self._updatebgrect)
+        self.fbind('size', self._updatebgrect)
+
+    def _updatebgcolour(self, widget, val):
+        self._bgcolor.rgba = val
+
+    def _updatebgrect(self, *args):
+        self._bgrect.pos = self.pos
+        self._bgrect.size = self.size
+
+# Text and background colours of a `NumEntry`, shared by all instances (kivy
+# copies a list into its own property value when it is assigned)
+_NUMENTRY_FG_VALID = [0,0,0,1]
+_NUMENTRY_FG_INVALID = [1,0,0,1]
+_NUMENTRY_BG_READONLY = [0.7,0.71,0.7,1]
+_NUMENTRY_BG_NORMAL = [1,1,1,1]
+
+# Characters besides digits that may be typed into a `NumEntry`
+_NUMENTRY_SYMBOLS = str.maketrans('', '', '.+-eE')
+
+def _isfloat(s:str) -> bool:
+    """Check in a single pass whether `s` is a plain decimal number such as
+    ``-12``, ``.5``, ``3.`` or ``+6.02e23``, that python's `float` would accept,
+    without creating the float or raising an exception."""
+    i, n = 0, len(s)
+    if i < n and s[i] in '+-':
+        i += 1
+    digits = False
+    while i < n and s[i].isdecimal():
+        i, digits = i+1, True
+    if i < n and s[i] == '.':
+        i += 1
+        while i < n and s[i].isdecimal():
+            i, digits = i+1, True
+    if not digits:
+        return False
+    if i < n and s[i] in 'eE':
+        i += 1
+        if i < n and s[i] in '+-':
+            i += 1
+        if i == n or not s[i].isdecimal():
+            return False
+        while i < n and s[i].isdecimal():
+            i += 1
+    return i == n
 
 class NumEntry(TextInput):
     """A single line text entry field that only accepts numeric input, with
     additional features for validation.
     
     :autovalidate: bool, Whether to automatically check if the input can
-        be parsed as a valid python `float`
+        be parsed as a valid python `float`. Defaults to True.
     :valid: bool, Property that indicates whether the current value is numerically
         valid. Supports both *get* and *set*.
     :ontext_callbacks: A list of functions that will be called each time the text
         in the input changes. They are called with 2 positional arguments - the 
         instance of this widget, and its current text value. If an unhandled exception 
         occurs in the call, it will be caught and passed to `kivy.logger.Logger`.
+        The calls are made in the next frame, only once for any number of changes
+        within a frame; `valid` and `get()` are already up to date by then.
     :\**kwargs: Any other keyword args will be passed to the constructor of
         `kivy.uix.textinput.TextInput`.
         
@@ -95,13 +138,22 @@ class NumEntry(TextInput):
     
     The text colour is black by default and red while it contains and invalid value.
     The background is set to grey when the `readonly` property is True, and white otherwise.
+
+    Only `valid` is a kivy property; `autovalidate` and `ontext_callbacks` are plain
+    attributes (nothing needs to bind to them), which can still be set from `kv` rules.
     """
 
-    autovalidate = BooleanProperty(True)
     valid = BooleanProperty(False)
-    ontext_callbacks = ListProperty([])
+    # The parsed value of the current text, updated by `self.on_text()`
+    _value = None
+    # The callbacks to be run by `self._run_callbacks()` in the next frame
+    _pending_callbacks = None
 
     def __init__(self, **kwargs):
+        # Set before the kv rules are applied, they may already change the text
+        self.autovalidate = kwargs.pop('autovalidate', True)
+        self.ontext_callbacks = list(kwargs.pop('ontext_callbacks', []))
+        self._trigger_callbacks = Clock.create_trigger(self._run_callbacks)
         super(NumEntry, self).__init__(**kwargs)
         self.multiline = False
         self.write_tab = False
@@ -109,23 +161,35 @@ class NumEntry(TextInput):
     def insert_text(self, substring:str, from_undo:bool=False) -> str:
         """Allow only unicode digit characters, ``+``, ``-``, ``e`` or ``E`` and ``.``
         to be typed into the textbox. Insert nothing if there are chars besides these."""
-        if re.search("[^\d\.\+\-eE]", substring):
-            return super(NumEntry, self).insert_text('', from_undo=from_undo)
+        digits = substring.translate(_NUMENTRY_SYMBOLS)
+        if digits and not digits.isdecimal():
+            # Rejected, skip the text update and undo entry for an empty insert
+            return
         return super(NumEntry, self).insert_text(substring, from_undo=from_undo)
 
     def on_text(self, widget:NumEntry, text:str):
         """Called automatically by kivy whenever `self.text` changes. 
-        If required, autovalidate the text; and then call all functions in
-        `self.ontext_callbacks`."""
+        If required, autovalidate the text; and then schedule all functions in
+        `self.ontext_callbacks` to be called by `self._run_callbacks()`.
+        Assigning the same text again does not dispatch the event (kivy's
+        `TextInput` ignores it), so there is no need to guard against that here.
+
+        The list of callbacks is taken now rather than when they are run, so text
+        set while `ontext_callbacks` is temporarily emptied schedules nothing."""
+        self._value = float(text) if _isfloat(text) else None
         if self.autovalidate:
+            self.valid = self._value is not None
+        if self.ontext_callbacks:
+            self._pending_callbacks = self.ontext_callbacks
+            self._trigger_callbacks()
+
+    def _run_callbacks(self, *args):
+        """Call the functions scheduled by `self.on_text()` with the latest text."""
+        callbacks, self._pending_callbacks = self._pending_callbacks, None
+        text = self.text
+        for fn in callbacks or ():
             try:
-                float(text)
-                self.valid = True
-            except ValueError:
-                self.valid = False
-        for fn in self.ontext_callbacks:
-            try:
-                fn(widget, text)
+                fn(self, text)
             except Exception as e:
                 Logger.error(f'Callback : Error while calling {fn} from on_text of {self}', 
                 exc_info=str(e))
@@ -133,30 +197,42 @@ class NumEntry(TextInput):
     def on_valid(self, widget, val):
         """Called automatically by kivy whenever `self.valid` is set.
         Change the text colour between red (invalid) and black (normal)."""
-        if val:
-            self.foreground_color = [0,0,0,1]
-        else:
-            self.foreground_color = [1,0,0,1]
+        self.foreground_color = _NUMENTRY_FG_VALID if val else _NUMENTRY_FG_INVALID
 
     def get(self) -> Union[float, None]:
         """Return the currently held value as a `float` if it can be parsed correctly,
-        else return `None` if it cannot."""
-        try:
-            return float(self.text)
-        except ValueError:
-            return None
+        else return `None` if it cannot. The text is parsed only once each time it
+        changes, in `self.on_text()`."""
+        return self._value
 
     def on_readonly(self, widget, val):
         """Called automatically by kivy whenever `self.readonly` is set.
         Change the background colour between grey (disabled) and white (normal)."""
-        if val:
-            self.background_color = [0.7,0.71,0.7,1]
-        else:
-            self.background_color = [1,1,1,1]
+        self.background_color = _NUMENTRY_BG_READONLY if val else _NUMENTRY_BG_NORMAL
 
 
 # ------------------- Info Dialog & Question Dialog ----------------------------
 
+class _DismissThenCall:
+    """Callable used as the action of the buttons in the dialogs of this module.
+    It closes the `popup`, and then calls `fn` with the first `nargs` of the
+    positional arguments it receives, or all of them if `nargs` is None. This
+    drops the button instance passed by kivy's `on_release` event when required."""
+
+    __slots__ = ('popup', 'fn', 'nargs')
+
+    def __init__(self, popup:Popup, fn:Callable[...,Any], nargs:Union[int,None]=None):
+        self.popup = popup
+        self.fn = fn
+        self.nargs = nargs
+
+    def __call__(self, *args):
+        self.popup.dismiss()
+        if self.nargs is not None:
+            args = args[:self.nargs]
+        self.fn(*args)
+
+
 class InfoDialog(Popup):
     r"""Create a kivy Popup to display a textual message with a title, 
     with an 'OK' button.
@@ -191,7 +267,7 @@ class InfoDialog(Popup):
         if action is None or action is self.dismiss:
             action = self.dismiss
         else :
-            action = self._closeandrun(action)
+            action = _DismissThenCall(self, action, nargs=0)
         content.add_widget(Button(text='OK', on_release=action,
                                   size_hint=(1, None), height='75dp',
                                   pos_hint={'center_x':0.5}))
@@ -200,13 +276,6 @@ class InfoDialog(Popup):
         if show :
             self.open()
 
-    def _closeandrun(self, fn):
-        # Close the popup and then call the user action
-        def finish(*args, **kwargs):
-            self.dismiss()
-            fn()
-        return finish
-
 
 class QuestionDialog(Popup):
     r"""Create a kivy Popup to prompt the user with a question, with 
@@ -242,25 +311,18 @@ class QuestionDialog(Popup):
         if action is None or action is self.dismiss:
             action = self.dismiss
         else :
-            action = self._closeandrun(action)
+            action = _DismissThenCall(self, action, nargs=1)
         btns = BoxLayout(spacing='5dp', padding='10dp',
                          size_hint=(0.9, None), height='75dp',
                          pos_hint={'center_x':0.5})
-        btns.add_widget(Button(text='Yes', on_release=lambda arg: action(True)))
-        btns.add_widget(Button(text='No', on_release=lambda arg: action(False)))
+        btns.add_widget(Button(text='Yes', on_release=partial(action, True)))
+        btns.add_widget(Button(text='No', on_release=partial(action, False)))
         content.add_widget(btns)
         super(QuestionDialog, self).__init__(title=self.title, content=content,
                                          size_hint=size_hint, **kwargs)
         if show: 
             self.open()
 
-    def _closeandrun(self, fn):
-        # Close the popup and then call the user action
-        def finish(*args, **kwargs):
-            self.dismiss()
-            fn(*args, **kwargs)
-        return finish
-
 
 class ContentDialog(Popup):
     r"""Create a kivy Popup to display a vertically scrollable sequence of 
@@ -312,6 +374,8 @@ class ContentDialog(Popup):
     classes = {'Label':Label, 'Image':Image, 'Widget':Widget,
         'Separator':SettingSpacer, 'WrapLabel':WrapLabel,
         'BGLabel':BGLabel, 'AsyncImage':AsyncImage}
+    # Only these widgets (and their subclasses) have `texture_size` and `texture_update`
+    _textured = (Label, Image)
 
     def __init__(self, widgets: Iterable[dict[str,Any]], title:str='Info',
             size_hint: tuple[float,float] = (0.5,0.5),
@@ -322,54 +386,53 @@ class ContentDialog(Popup):
         if action is None or action is self.dismiss:
             action = self.dismiss
         else :
-            action = self._closeandrun(action)
+            action = _DismissThenCall(self, action, nargs=0)
 
         content = BoxLayout(orientation='vertical', spacing='10dp')
         self.scrollarea = ScrollView(**kwargs)
         content.add_widget(self.scrollarea)
-        footer = GridLayout(rows=1, size_hint=(1,None), height='50dp')
-        footer.add_widget(Widget(size_hint=(0.333,1)))
+        # The button is centred in the middle third of the footer
+        footer = AnchorLayout(size_hint=(1,None), height='50dp')
         footer.add_widget(Button(text='OK', on_release=action,
-                                  size_hint=(0.333, 0.8),
-                                  pos_hint={'center_x':0.5}))
-        footer.add_widget(Widget(size_hint=(0.333,1)))
+                                  size_hint=(0.333, 0.8)))
         content.add_widget(footer)
         super(ContentDialog, self).__init__(title=self.title, content=content,
                                          size_hint=size_hint)
+        # Resizing is done once in the frame after any number of requests, and
+        # only re-renders the widgets whose content or width has changed
+        self._trigger_updatesize = Clock.create_trigger(self._updatesize)
+        self._rendered = {}
         
         self.widgetarea = BoxLayout(orientation='vertical',
             padding=padding, spacing=spacing, size_hint=(1,None),)
-        self.scrollarea.add_widget(self.widgetarea)
+        # Fill the layout before it is attached to the scrollview, and create each
+        # widget with its final size hint, so that neither is updated repeatedly
+        add_widget = self.widgetarea.add_widget
+        classes = self.classes
         for w in widgets:
             try:
                 c = w.pop('class', None)
-                if c not in self.classes:
+                cls = classes.get(c)
+                if cls is None:
                     Logger.warning(f"ContentDialog : Widget {c} is not supported")
                     continue
-                wgt = self.classes[c](**w)
-                wgt.size_hint = (1, None)
-                self.widgetarea.add_widget(wgt)
+                w['size_hint'] = (1, None)
+                add_widget(cls(**w))
             except Exception as err:
                 Logger.error(f"ContentDialog : Error creating widget {w}", 
                     exc_info = str(err))
                 continue
+        self.scrollarea.add_widget(self.widgetarea)
 
         if show:
             self.open()
 
-    def _closeandrun(self, fn):
-        # ignore arguments passed & close the dialog, then call the function
-        def finish(*args, **kwargs):
-            self.dismiss()
-            fn()
-        return finish
-
     def open(self):
         """Open the popup, and resize all the text/image widgets neatly."""
         super(ContentDialog, self).open()
-        self._updatesize()
+        self._trigger_updatesize()
 
-    def _updatesize(self):
+    def _updatesize(self, *args):
         """Manually compute the required sizes of all the Label and Image widgets
         to fit neatly in the layout. Start with a height of 10px for the entire 
         layout, find from kivy the actual size needed to contain the text/image
@@ -377,23 +440,35 @@ class ContentDialog(Popup):
         and increase layout's height accordingly.
         
         Note: if the label isn't forced to wrap its text, it can still overflow
-        horizontally though height/line spacing are adjusted."""
-        self.widgetarea.height = 10
-        for x in self.widgetarea.children:
-            if any([isinstance(x, c) for c in \
-                # Only these widgets have `texture_size` and `texture_update`
-                (Label, Image, WrapLabel, AsyncImage, BGLabel)]):
-                x.width = 0.95 * self.width
-                # Use popup width, layout width may also be unpredictable
-                x.texture_update()
-                # Force the widget to resize its text/image content
-                # (different from its own widget size)
+        horizontally though height/line spacing are adjusted.
+        
+        This is called through `self._trigger_updatesize()` in the next frame."""
+        area = self.widgetarea
+        height = 10
+        spacing = area.spacing
+        # Use popup width, layout width may also be unpredictable
+        width = 0.95 * self.width
+        textured, rendered = self._textured, self._rendered
+        for x in area.children:
+            if isinstance(x, textured):
+                x.width = width
+                key = (width, getattr(x, 'text', None), 
+                       getattr(x, 'source', None), getattr(x, 'font_size', None))
+                if rendered.get(x) != key:
+                    # Force the widget to resize its text/image content
+                    # (different from its own widget size)
+                    x.texture_update()
+                    rendered[x] = key
                 x.height = x.texture_size[1]
-            self.widgetarea.height += x.height + self.widgetarea.spacing
+            height += x.height + spacing
+        area.height = height
 
 
 # -------------------------- File I/O Dialogs ---------------------------------------
 
+# Text before the folder address shown below the file browser
+_LOCATION_PREFIX = "  Location : "
+
 class SaveFileDialog(Popup):
     """Dialog containing a List-view file system browser, to use as a 'Save As'
     prompt. The user can select any folder location to save in, and enter a filename
@@ -409,7 +484,7 @@ class SaveFileDialog(Popup):
     :size_hint: Tuple of 2 floats to use as the kivy size hint for the popup dialog.
         Defaults to (0.8, 0.8).
     :initial_dir: str (path), Address of a directory which the filechooser should
-        initially open to. Use the program's directory (`"."`) if invalid or unspecified.
+        initially open to. Use the program's working directory if invalid or unspecified.
     :rootdir: str (path), Address of the topmost directory that will be accessible
         through the file browser, in the same filesystem tree. Use no particular
         location (`""`) if invalid or unspecified.
@@ -447,7 +522,7 @@ class SaveFileDialog(Popup):
     `self.filechooser`, in case it needs to be customised further."""
 
     def __init__(self, title:str='Save As', size_hint:tuple[float,float]=(0.8,0.8),
-            initial_dir:str=".", rootdir:str='', ext:str='', fileobj:bool=False, 
+            initial_dir:Union[str,None]=None, rootdir:str='', ext:str='', fileobj:bool=False, 
             action:Union[Callable[[TextIO],Any], Callable[[str,str],Any]] = None,
             mode:str='w', encoding:Union[str,None]='utf-8', show:bool=True, **kwargs):
         # Store various properties
@@ -460,26 +535,32 @@ class SaveFileDialog(Popup):
         self.enc = encoding
         self.filename = ''
         # Ensure that given paths exist
-        if not os.path.isdir(os.path.abspath(self.idir)) :
-            self.idir = os.path.abspath('.')
-        if not os.path.isdir(os.path.abspath(self.root)) :
+        if self.idir and os.path.isdir(self.idir) :
+            # The filechooser then reports only absolute paths
+            self.idir = os.path.abspath(self.idir)
+        else :
+            self.idir = os.getcwd()
+        if not os.path.isdir(self.root) :
             self.root = ''
         # Decorate callback 
         if action is None or action is self.dismiss:
             self.action = self.dismiss
         else :
-            self.action = self._closeandrun(action)
+            self.action = _DismissThenCall(self, action)
 
         # Create GUI
         kwargs.pop('content', None)
         self.content = BoxLayout(orientation='vertical')
         self.filechooser = FileChooserListView(path=self.idir, rootpath=self.root)
         self.content.add_widget(self.filechooser)
-        self.folderlbl = Label(text="  Location : "+self.idir, size_hint_y=None, 
+        self.folderlbl = Label(text=f"{_LOCATION_PREFIX}{self.idir}", size_hint_y=None, 
             height='35dp')
         self.content.add_widget(self.folderlbl)
-        self.filechooser.bind(path=self._updateflbl)
-        self.filechooser.bind(selection=self._updatesel)
+        # The location and name are shown once per frame, however often they change
+        self._trigger_updateflbl = Clock.create_trigger(self._updateflbl)
+        self._trigger_updatesel = Clock.create_trigger(self._updatesel)
+        self.filechooser.fbind('path', self._trigger_updateflbl)
+        self.filechooser.fbind('selection', self._trigger_updatesel)
         self.namefield = TextInput(multiline=False, hint_text="Enter a filename", 
             text = "Untitled" + self.ext, size_hint_y=None, height='35dp', 
             on_text_validate = self.testvalid)
@@ -495,72 +576,61 @@ class SaveFileDialog(Popup):
         if show:
             self.open()
 
-    def _closeandrun(self, fn):
-        # Close the dialog before performing the requested callabck
-        def finish(*args, **kwargs):
-            self.dismiss()
-            if hasattr(fn, '__call__'):
-                fn(*args, **kwargs)
-        return finish
-
-    def _updateflbl(self, widget, val):
-        self.folderlbl.text = "  Location : "+os.path.abspath(val)
+    def _updateflbl(self, *args):
+        self.folderlbl.text = f"{_LOCATION_PREFIX}{self.filechooser.path}"
 
-    def _updatesel(self, widget, val):
-        if len(widget.selection) == 1:
-            self.namefield.text = os.path.split(widget.selection[0])[1]
+    def _updatesel(self, *args):
+        val = self.filechooser.selection
+        if len(val) == 1:
+            self.namefield.text = os.path.basename(val[0])
 
     def testvalid(self, widget, evalue=None):
         """Initiate the save process by ensuring that a file can be created at the
         given path. Prompt the user in case of a filename collision. If successful,
         proceed to perform `self.action`."""
-        cwd = os.getcwd()
-        try :
-            os.chdir(self.filechooser.path)
-            if len(self.namefield.text) == 0:
-                InfoDialog(title='Error', message='Filename cannot be blank', show=True)
-                os.chdir(cwd)
-                return
-            # Check for an extension, append default one if not present
-            e = os.path.splitext(self.namefield.text)[1]
-            if not e :
-                self.filename =  self.namefield.text + self.ext
-                self.namefield.text = self.filename
-            else :
-                self.filename = self.namefield.text
-            # Check if filename is valid by trying to create the file exclusively
-            # If a file object needs to be returned instead of the path, return this
-            # Otherwise close & delete it, then return the path
-            tmp = open(self.filename, 'x', encoding=self.enc)
-            if self.fileobj and self.mode in ('w', 'x'):
-                self.callfn(True, tmp)
-                return
-            tmp.close()
-            os.remove(self.filename)
-        
-        except FileExistsError:
-            QuestionDialog(question=f'"{self.filename}" already exists. Replace it ?',
-                action=self.callfn)
+        if len(self.namefield.text) == 0:
+            InfoDialog(title='Error', message='Filename cannot be blank', show=True)
             return
-        except :
+        # Check for an extension, append default one if not present
+        e = os.path.splitext(self.namefield.text)[1]
+        if not e :
+            self.filename =  self.namefield.text + self.ext
+            self.namefield.text = self.filename
+        else :
+            self.filename = self.namefield.text
+        # Check that the name refers to a file directly inside the chosen folder,
+        # and that the folder is writable. This does not catch every name the OS
+        # rejects, so errors on actually writing the file are handled by
+        # `self.callfn()` or by `self.action` itself
+        path = os.path.join(self.filechooser.path, self.filename)
+        if os.path.basename(path) != self.filename or \
+           not os.access(self.filechooser.path, os.W_OK):
             # Invalid name or path
-            Logger.error('SaveFileDialog : {}'.format(sys.exc_info()[2]))
+            Logger.error(f'SaveFileDialog : Cannot save to {path}')
             InfoDialog(title='Error', message='The specified address {} is invalid'.format(
-                os.path.join(self.filechooser.path, self.namefield.text)))
-            os.chdir(cwd)
+                path))
+            return
+        if os.path.lexists(path):
+            QuestionDialog(question=f'"{self.filename}" already exists. Replace it ?',
+                action=self.callfn)
             return
-        finally :
-            os.chdir(cwd)
         self.callfn(True)
 
     def callfn(self, yn, obj=None):
         """Call `self.action` with the appropriate arguments, if `yn` is True."""
         if yn :
             if self.fileobj:
-                if obj is not None:
-                    self.action(obj)
-                else :
-                    self.action(open(self.filename,self.mode,encoding=self.enc))
+                if obj is None:
+                    path = os.path.join(self.filechooser.path, self.filename)
+                    try :
+                        obj = open(path, self.mode, encoding=self.enc)
+                    except OSError as err:
+                        Logger.error(f'SaveFileDialog : Cannot open {path}',
+                            exc_info=str(err))
+                        InfoDialog(title='Error',
+                            message='The specified address {} is invalid'.format(path))
+                        return
+                self.action(obj)
             else :
                 self.action(self.filechooser.path, self.namefield.text)
 
@@ -578,7 +648,7 @@ class OpenFileDialog(Popup):
     :size_hint: Tuple of 2 floats to use as the kivy size hint for the popup dialog.
         Defaults to (0.8, 0.8).
     :initial_dir: str (path), Address of a directory which the filechooser should
-        initially open to. Use the program's directory (`"."`) if invalid or unspecified.
+        initially open to. Use the program's working directory if invalid or unspecified.
     :rootdir: str (path), Address of the topmost directory that will be accessible
         through the file browser, in the same filesystem tree. Use no particular
         location (`""`) if invalid or unspecified.
@@ -618,7 +688,7 @@ class OpenFileDialog(Popup):
     `self.filechooser`, in case it needs to be customised further."""
 
     def __init__(self, title:str='Open', size_hint:tuple[float,float]=(0.8,0.8),
-            initial_dir:str = ".", rootdir:str = '', multiselect:bool = False, 
+            initial_dir:Union[str,None] = None, rootdir:str = '', multiselect:bool = False, 
             fileobj:bool = False, encoding:Union[str,None]='utf-8',
             action: Union[Callable[[Union[TextIO, list[TextIO]]],Any],
              Callable[[str,str],Any]] = None, mode:str = 'r', 
@@ -634,25 +704,31 @@ class OpenFileDialog(Popup):
         self.filename = ''
         kwargs.pop('content', None)
  
-        if not os.path.isdir(os.path.abspath(self.idir)) :
-            self.idir = os.path.abspath('.')
-        if not os.path.isdir(os.path.abspath(self.root)) :
+        if self.idir and os.path.isdir(self.idir) :
+            # The filechooser then reports only absolute paths
+            self.idir = os.path.abspath(self.idir)
+        else :
+            self.idir = os.getcwd()
+        if not os.path.isdir(self.root) :
             self.root = ''
         if action is None or action is self.dismiss:
             self.action = self.dismiss
         else :
-            self.action = self._closeandrun(action)
+            self.action = _DismissThenCall(self, action)
 
         # Create GUI
         self.content = BoxLayout(orientation='vertical')
         self.filechooser = FileChooserListView(path=self.idir, rootpath=self.root,
             multiselect=self.multi)
         self.content.add_widget(self.filechooser)
-        self.folderlbl = Label(text="  Location : "+self.idir, size_hint_y=None,
+        self.folderlbl = Label(text=f"{_LOCATION_PREFIX}{self.idir}", size_hint_y=None,
             height='35dp')
         self.content.add_widget(self.folderlbl)
-        self.filechooser.bind(path=self._updateflbl)
-        self.filechooser.bind(selection=self._updatesel)
+        # The location and name are shown once per frame, however often they change
+        self._trigger_updateflbl = Clock.create_trigger(self._updateflbl)
+        self._trigger_updatesel = Clock.create_trigger(self._updatesel)
+        self.filechooser.fbind('path', self._trigger_updateflbl)
+        self.filechooser.fbind('selection', self._trigger_updatesel)
         self.namefield = TextInput(multiline=False, hint_text="", size_hint_y=None, 
             height='35dp', readonly=True)
         self.content.add_widget(self.namefield)
@@ -667,57 +743,55 @@ class OpenFileDialog(Popup):
         if show:
             self.open()
 
-    def _closeandrun(self, fn):
-        def finish(*args, **kwargs):
-            self.dismiss()
-            if hasattr(fn, '__call__'):
-                fn(*args, **kwargs)
-        return finish
-
-    def _updateflbl(self, widget, val):
-        self.folderlbl.text = "  Location : "+os.path.abspath(val)
+    def _updateflbl(self, *args):
+        self.folderlbl.text = f"{_LOCATION_PREFIX}{self.filechooser.path}"
 
-    def _updatesel(self, widget, val):
+    def _updatesel(self, *args):
+        val = self.filechooser.selection
         if self.multi:
-            names = ['"' + os.path.split(addr)[1] + '"' for addr in widget.selection]
-            self.namefield.text = ' '.join(names)
-        elif len(widget.selection)==1 :
-            self.namefield.text = os.path.split(widget.selection[0])[1]
+            self.namefield.text = ' '.join('"' + os.path.basename(addr) + '"'
+                                           for addr in val)
+        elif len(val)==1 :
+            self.namefield.text = os.path.basename(val[0])
 
     def testvalid(self, widget):
         """Initiate the open process by checking that some file has been selected
         and that it is accessible by the program. Inform the user in either case
         if there would be an error."""
-        if len(self.filechooser.selection) == 0:
+        selection = self.filechooser.selection
+        if len(selection) == 0:
             InfoDialog(title='Warning', message='No files have been selected')
             return
-        for addr in self.filechooser.selection :
-            if not os.path.isfile(addr):
+        # The files are only checked here if the addresses are returned as they are;
+        # otherwise `open()` in `self.callfn()` reports any that cannot be read
+        if not self.fileobj:
+            # Report all the invalid addresses together in one dialog
+            invalid = [addr for addr in selection if not os.path.isfile(addr)]
+            if invalid:
                 InfoDialog(title='Error', 
-                    message='The specified address {} is invalid'.format(
-                    os.path.join(self.filechooser.path, self.namefield.text)))
+                    message='The specified address {} is invalid'.format(', '.join(invalid)))
                 return
         self.callfn(True)
 
     def callfn(self, yn):
         """Call `self.action` with the appropriate arguments, if `yn` is True."""
         if yn :
-            cwd = os.getcwd()
             if self.fileobj:
+                folder = self.filechooser.path
                 try :
                     files = []
-                    os.chdir(self.filechooser.path)
+                    # The selection holds absolute paths, which `join` keeps as they
+                    # are; the working directory of the program is not changed
                     for file in self.filechooser.selection :
-                        files.append(open(file, self.mode, encoding=self.enc))
-                except:
+                        files.append(open(os.path.join(folder, file), self.mode,
+                                          encoding=self.enc))
+                except Exception as err:
                     InfoDialog(title='Error', 
                         message='There was an error opening the file {} '.format(
-                        os.path.join(self.filechooser.path, self.namefield.text)))
-                    Logger.error('OpenFileDialog : {}'.format(sys.exc_info()[2]))
-                    os.chdir(cwd)
+                        os.path.join(folder, self.namefield.text)))
+                    Logger.error('OpenFileDialog : Cannot open the selected files',
+                        exc_info=str(err))
                     return
-                finally:
-                    os.chdir(cwd)
                 if self.multi :
                     self.action(files)
                 elif len(files) != 0 :
@@ -740,18 +814,26 @@ class StencilBox(StencilView, FloatLayout):
     
     Reference - https://stackoverflow.com/a/49221416
     """
+    def _collide(self, touch) -> bool:
+        # Same as `self.collide_point(*touch.pos)`, but reads `pos` and `size`
+        # directly instead of computing the `right` and `top` alias properties
+        x, y = touch.pos
+        sx, sy = self.pos
+        w, h = self.size
+        return sx <= x <= sx + w and sy <= y <= sy + h
+
     def on_touch_down(self, touch):
-        if not self.collide_point(*touch.pos):
+        if not self._collide(touch):
             return
         return super(StencilBox, self).on_touch_down(touch)
 
     def on_touch_move(self, touch):
-        if not self.collide_point(*touch.pos):
+        if not self._collide(touch):
             return
         return super(StencilBox, self).on_touch_move(touch)
 
     def on_touch_up(self, touch):
-        if not self.collide_point(*touch.pos):
+        if not self._collide(touch):
             return
         return super(StencilBox, self).on_touch_up(touch)
 
@@ -761,6 +843,11 @@ class StencilBox(StencilView, FloatLayout):
 _ColourFormat = Union["tuple[float,float,float,float]",
                       Iterable[float]]
 
+def _clamp01(x:float) -> float:
+    # Error handler for the bounded colour properties, that replaces an
+    # out of range value with the closest limit of the interval [0,1]
+    return 0. if x < 0. else (1. if x > 1. else x)
+
 class ColourChooser(BoxLayout):
     """Provides a simple 2-panel widget that allows selection of an RGB or
     RGBA colour via sliders for each component value, alongside a 'live'
@@ -789,116 +876,49 @@ class ColourChooser(BoxLayout):
 
     transparency = BooleanProperty(True)
     r = BoundedNumericProperty(0.5, min=0., max=1.,
-                               errorhandler=lambda x: 1. if x > 1 else 0.)
+                               errorhandler=_clamp01)
     g = BoundedNumericProperty(0.2, min=0., max=1.,
-                               errorhandler=lambda x: 1. if x > 1 else 0.)
+                               errorhandler=_clamp01)
     b = BoundedNumericProperty(0.8, min=0., max=1.,
-                               errorhandler=lambda x: 1. if x > 1 else 0.)
+                               errorhandler=_clamp01)
     a = BoundedNumericProperty(1.0, min=0., max=1.,
-                               errorhandler=lambda x: 1. if x > 1 else 0.)
+                               errorhandler=_clamp01)
     colour = ReferenceListProperty(r, g, b, a)
     red = ObjectProperty(None)
     green = ObjectProperty(None)
     blue = ObjectProperty(None)
     alpha = ObjectProperty(None)
     display = ObjectProperty(None)
+    # Whether the colour is being changed by one of the sliders
+    _from_slider = False
+    # Texts of the labels above the sliders, indexed by channel and slider value,
+    # so the `kv` rules do not format a new string at every step
+    _labels = tuple(tuple(f'{name} : {i}' for i in range(256))
+                    for name in ('Red', 'Green', 'Blue', 'Alpha'))
 
     def _update_colour(self, c='', val=None):
-        """Change the values of attributes based on slider movement"""
-        if val is not None :
-            if c is 'r' :
-                self.r = val
-            elif c is 'g':
-                self.g = val
-            elif c is 'b':
-                self.b = val
-            elif c is 'a':
-                self.a = val
-
-    # Update the text in the UI based on the colour values set
-    # The binding is automatic using kivy's `on_<propname>` ability
-    def on_r(self, obj, val):
-        self.red.value = int(255*val)
-        
-    def on_g(self, obj, val):
-        self.green.value = int(255*val)
-        
-    def on_b(self, obj, val):
-        self.blue.value = int(255*val)
-        
-    def on_a(self, obj, val):
-        self.alpha.value = int(255*val)
-
-Builder.load_string("""
-#:import dp kivy.metrics.dp
-<ColourSlider@Slider>:
-    min: 0
-    max: 255
-    step: 1
-    value_track: True
-    size_hint_x: 0.9
-
-<ColourChooser>:
-    red: red
-    green: green
-    blue: blue
-    alpha: alpha
-    display: colourdisplay
-    # spacing: '20dp'
-    pos_hint: {'center_x':0.5, 'center_y':0.5}
-    BoxLayout:
-        # Left panel, contains the sliders
-        id: sliderpanel
-        spacing: '5dp'
-        orientation: 'vertical'
-        padding_x: '20dp'
-        Label:
-            text: 'Red : {}'.format(int(red.value))
-        ColourSlider:
-            id: red
-            value: 125
-            value_track_color: [1,0,0,1]
-            on_value: root._update_colour('r', self.value_normalized)
-        Label:
-            text: 'Green : {}'.format(int(green.value))
-        ColourSlider:
-            id: green
-            value: 50
-            value_track_color: [0,1,0,1]
-            on_value: root._update_colour('g', self.value_normalized)
-        Label:
-            text: 'Blue : {}'.format(int(blue.value))
-        ColourSlider:
-            id: blue
-            value: 200
-            value_track_color: [0,0,1,1]
-            on_value: root._update_colour('b', self.value_normalized)
-        Label:
-            text: 'Alpha : {}'.format(int(alpha.value))
-        ColourSlider:
-            id: alpha
-            value: 255
-            value_track_color: [1,1,1,1]
-            disabled: not root.transparency
-            on_value: root._update_colour('a', self.value_normalized)
-    Label:
-        id: colourdisplay
-        size_hint: 0.9, 0.9
-        width: root.width - sliderpanel.width - dp(20)
-        height: root.height - dp(20)
-        pos_hint: {'center_x': 0.45, 'center_y': 0.5}
-        canvas:
-            Rectangle:
-                source: 'icons/transparent-bg.jpg'
-                pos: self.pos
-                size: self.size
-            Color:
-                rgba: (red.value_normalized, green.value_normalized, \
-                       blue.value_normalized, alpha.value_normalized)
-            Rectangle:
-                pos: self.pos
-                size: self.size                
-""", filename='cw_ColourChooser.kv')
+        """Change the values of attributes based on slider movement. `val` is
+        the slider's value, from 0 to 255 (used directly instead of the slider's
+        `value_normalized` alias property, which computes the same fraction)"""
+        if val is not None and c in ('r', 'g', 'b', 'a'):
+            # The sliders already show this value, so `on_colour` need not
+            # write all of them back again
+            self._from_slider = True
+            try:
+                setattr(self, c, val / 255.)
+            finally:
+                self._from_slider = False
+
+    # Update the sliders in the UI based on the colour values set
+    # The binding is automatic using kivy's `on_<propname>` ability, and `colour`
+    # is dispatched once even when all 4 of its components are set together
+    def on_colour(self, obj, val):
+        if self._from_slider:
+            return
+        r, g, b, a = val
+        self.red.value, self.green.value, self.blue.value, self.alpha.value = \
+            int(255*r), int(255*g), int(255*b), int(255*a)
+
 
 class ColourChooserPopup(Popup):
     r"""Dialog containing a `ColourChooser` widget with 'Select' and 'Cancel'
@@ -922,6 +942,9 @@ class ColourChooserPopup(Popup):
         Defaults to True.
     :\**kwargs: Any other keyword args will be passed to the constructor of
         `kivy.uix.popup.Popup`
+
+    The `ColourChooser` and buttons are only created when the popup is first opened,
+    the chooser is then referenced by `self.cch` (which is `None` until then).
     """
 
     def __init__(self, title: str = "Colours", 
@@ -933,14 +956,31 @@ class ColourChooserPopup(Popup):
         
         kwargs.pop('content', None)
         self.title = title
-        content = BoxLayout(orientation='vertical')
-        self.cch = ColourChooser(size_hint=(0.9, 0.9), transparency=transparency)
-        self.cch.r, self.cch.g, self.cch.b, self.cch.a = colour
-        content.add_widget(self.cch)
+        # The content is only created when the dialog is first opened
+        self.cch = None
+        self._initcolour = colour
+        self._transparency = transparency
         if action is None or action is self.dismiss:
-            action = self.dismiss
+            self._action = self.dismiss
         else :
-            action = self._closeandrun(action)
+            self._action = _DismissThenCall(self, action)
+        super(ColourChooserPopup, self).__init__(title=self.title,
+                            size_hint=size_hint, **kwargs)
+        if show :
+            self.open()
+
+    def open(self, *args, **kwargs):
+        """Open the dialog, creating its content the first time."""
+        if self.cch is None:
+            self._build_content()
+        super(ColourChooserPopup, self).open(*args, **kwargs)
+
+    def _build_content(self):
+        content = BoxLayout(orientation='vertical')
+        self.cch = ColourChooser(size_hint=(0.9, 0.9), transparency=self._transparency)
+        self.cch.colour = self._initcolour
+        content.add_widget(self.cch)
+        action = self._action
         btns = BoxLayout(spacing='5dp', padding='10dp',  height='80dp',
                          pos_hint={'center_x':0.5}, size_hint=(0.9, None))
         btns.add_widget(Button(text='Select',
@@ -948,18 +988,8 @@ class ColourChooserPopup(Popup):
         btns.add_widget(Button(text='Cancel',
                             on_release=lambda arg : action(None)))
         content.add_widget(btns)
-        super(ColourChooserPopup, self).__init__(title=self.title,
-                            content=content, size_hint=size_hint, **kwargs)
-        if show :
-            self.open()
+        self.content = content
 
-    def _closeandrun(self, fn):
-        # Close the dialog, then perform required callback
-        def finish(*args, **kwargs):
-            self.dismiss()
-            if hasattr(fn, '__call__'):
-                fn(*args, **kwargs)
-        return finish
 
 
 # ------------------------------ Settings --------------------------------------
@@ -971,7 +1001,7 @@ class SettingColour(SettingItem):
     The contents of this class are similar to those of 
     `kivy.uix.settings.SettingString`, refer to the kivy source for 
     comparison; except that the popup containing a text field is replaced
-    with `ColourChooserPopup`, and the content label's foreground/text colour
+    with `ColourChooserPopup`, and the content label's background colour
     is adjusted to match it.
     """
 
@@ -981,7 +1011,9 @@ class SettingColour(SettingItem):
     def __init__(self, **kwargs):
         super(SettingColour, self).__init__(**kwargs)
         ivalue = [0.1, 0.1, 0.1, 1]
-        self.clbl = Label(text='████████████', color=ivalue)
+        # An empty `BGLabel`, its background rectangle shows the colour
+        self.clbl = BGLabel(bgcolour=ivalue, size_hint=(1, 0.4),
+                            pos_hint={'center_y':0.5})
         self.content.add_widget(self.clbl)
 
     def on_panel(self, instance, value):
@@ -1000,7 +1032,7 @@ class SettingColour(SettingItem):
         self._dismiss()
         value = self.cch.colour
         self.value = value
-        self.clbl.color = value
+        self.clbl.bgcolour = list(value)
 
     def _create_popup(self, instance):
         # create popup layout
@@ -1012,9 +1044,8 @@ class SettingColour(SettingItem):
 
         # create the colourchooser widget
         cch = ColourChooser(size_hint=(0.9, 0.9))
-        if len(self.value)==4 and all([x >= 0. for x in self.value]) and \
-           all([x <= 1. for x in self.value]) :
-            cch.r, cch.g, cch.b, cch.a = self.value
+        if len(self.value)==4 and all(0. <= x <= 1. for x in self.value) :
+            cch.colour = self.value
         self.cch = cch
 
         # construct the content, widget are used as a spacer
@@ -1026,10 +1057,10 @@ class SettingColour(SettingItem):
         # 2 buttons are created for accept or cancel the current value
         btnlayout = BoxLayout(size_hint_y=None, height='50dp', spacing='5dp')
         btn = Button(text='Ok')
-        btn.bind(on_release=self._validate)
+        btn.fbind('on_release', self._validate)
         btnlayout.add_widget(btn)
         btn = Button(text='Cancel')
-        btn.bind(on_release=self._dismiss)
+        btn.fbind('on_release', self._dismiss)
         btnlayout.add_widget(btn)
         ccontent.add_widget(btnlayout)
 
@@ -1082,17 +1113,17 @@ class SettingPathWRoot(SettingPath):
         self.textinput = textinput = FileChooserListView(
             rootpath=rp, size_hint=(1, 1), path=initial_path,
             dirselect=self.dirselect, show_hidden=self.show_hidden)
-        textinput.bind(on_path=self._validate)
+        textinput.fbind('on_path', self._validate)
         
         # construct the content
         content.add_widget(textinput)
         content.add_widget(SettingSpacer())
         btnlayout = BoxLayout(size_hint_y=None, height='50dp', spacing='5dp')
         btn = Button(text='Ok')
-        btn.bind(on_release=self._validate)
+        btn.fbind('on_release', self._validate)
         btnlayout.add_widget(btn)
         btn = Button(text='Cancel')
-        btn.bind(on_release=self._dismiss)
+        btn.fbind('on_release', self._dismiss)
         btnlayout.add_widget(btn)
         content.add_widget(btnlayout)
         
@@ -12,8 +12,10 @@ from __future__ import annotations
 import kivy
 kivy.require('1.11.0')
 import os, sys, math, json, time
+from itertools import chain
+from functools import lru_cache
+from collections import deque
 from datetime import datetime
-import sympy
 from typing import Any, Iterable, Union, TextIO
 
 from kivy.app import App
@@ -47,18 +49,59 @@ def to_polar(x:float, y:float, rad:float=False) -> tuple[float,float]:
     """Convert 2D cartesian coords (`x`, `y`) to polar (mag, angle)
     Angle is returned in degrees, unless `rad=True`"""
     m = math.hypot(x, y)
-    a = math.degrees(math.atan(y/x)) if x != 0. else 90
-    if x < 0 : a += 180
-    elif x == 0. and y < 0: a = 270
-    elif x > 0 and y < 0: a += 360
     if rad :
-        a *= math.pi / 180.
+        a = math.atan2(y, x) % (2*math.pi)
+    else :
+        a = math.degrees(math.atan2(y, x)) % 360
     return (m, a)
 
+@lru_cache(maxsize=256)
+def _hexcolour(c:tuple[float,...]) -> str:
+    """Cached implementation of `hexcolour()`, `c` must be a (hashable) tuple"""
+    # Not `bytes(...).hex()`, which raises for a channel slightly outside [0, 1]
+    return '#' + ''.join(['%02x' % int(i*255) for i in c])
+
 def hexcolour(c:Iterable[float]) -> str:
     """Convert a list/tuple `c` of floats *in the closed interval [0,1]* 
     representing a colour to hex string ``#rrggbb`` format"""
-    return '#' + ''.join([hex(int(i*255))[2:].rjust(2,'0') for i in c])
+    return _hexcolour(tuple(c))
+
+def _accelerations(xs:list[float], ys:list[float], ms:list[float], G:float, 
+                   r_cut2:float=0) -> tuple[list[float],list[float],list[tuple[int,int]]]:
+    """Find the net gravitational acceleration of each of a set of point masses, 
+    given as flat lists of their X and Y coordinates and masses (the same index
+    refers to the same body in each list), in a gravitational system with constant `G`.
+    Return the lists of X and Y components of acceleration, and a list of the index
+    pairs `(i, j)` with `i < j` of bodies at exactly the same position, which do not
+    exert any force on each other.
+    If `r_cut2` is positive, pairs whose squared distance exceeds it are skipped."""
+    n = len(xs)
+    axs, ays = [0.]*n, [0.]*n
+    overlaps = []
+    sqrt = math.sqrt
+    # Each pair is visited once, and its force applied to both bodies in opposite
+    # directions; body `i` already holds the terms from all `j < i` when it is reached
+    for i in range(n):
+        xi, yi, mi = xs[i], ys[i], ms[i]
+        ax, ay = axs[i], ays[i]
+        for j in range(i+1, n):
+            dx, dy = xs[j] - xi, ys[j] - yi
+            r2 = dx*dx + dy*dy
+            if r2 == 0 :
+                overlaps.append((i, j))
+                continue
+            if r_cut2 and r2 > r_cut2 :
+                continue
+            # G/r^3 with a single square root; a huge `r2` becomes `inf` (and `k`
+            # zero) rather than raising `OverflowError` like `r**3`
+            k = G / (r2 * sqrt(r2))
+            ki, kj = k * mi, k * ms[j]
+            ax += kj * dx
+            ay += kj * dy
+            axs[j] -= ki * dx
+            ays[j] -= ki * dy
+        axs[i], ays[i] = ax, ay
+    return axs, ays, overlaps
 
 
 class PlanetObject :
@@ -97,103 +140,88 @@ class PlanetObject :
         self.radius = radius
         self.trail = trail
         ## Queue of coords the body has been at, length of min=2, max=`trail`
-        self.positions = [(self.x, self.y)]*2 
+        ## (unlimited if `trail` is negative); the oldest are dropped automatically
+        self.positions = deque([(self.x, self.y)]*2,
+                               maxlen=max(self.trail, 2) if self.trail > 0 else None)
         self.has_collided = False
         self.idx = str(idx)
         self.polar = polar
         self.system._add_obj(self)
-        ## Label widget will be displayed in the animation GUI if required
-        self.info = BGLabel(size_hint=(None, None), bgcolour=[0.2,0.2,0.2,0.5],
-                            width='200dp', height='80dp', color=[1,1,1,1],
-                            markup=True, text=str(self), font_size='11sp')
-        #self.info.height = self.info.minimum_height
+        ## Label widget will be displayed in the animation GUI if required, it is
+        ## only created when `info` is first accessed; `_infotext` is the fixed text
+        ## shown instead of `str(self)` once the body has been removed
+        self._info = None
+        self._infotext = None
         Logger.info(f"Simulation : New object - ({self.idx}, {hexcolour(self.colour)}, \
 M={self.mass}, R={self.radius}, pos=({self.x}, {self.y}), vel=({self.vx}, {self.vy}), \
 trail={self.trail}, polar={self.polar}")
 
+    @property
+    def info(self) -> BGLabel:
+        """Label showing the current attributes of the body in the animation GUI"""
+        if self._info is None :
+            self._info = BGLabel(size_hint=(None, None), bgcolour=[0.2,0.2,0.2,0.5],
+                                 width='200dp', height='80dp', color=[1,1,1,1], markup=True,
+                                 text=self._infotext or str(self), font_size='11sp')
+        return self._info
+
+    def _set_infotext(self, text:str) -> None:
+        """Fix the text of the `info` label, when the body is no longer active"""
+        self._infotext = text
+        if self._info is not None :
+            self._info.text = text
+
     def _neatpos(self, p1:float, p2:float) -> tuple[float,float]:
         """Short representaion of a 2D vector for printing (rounded off to 5 places), 
         in the appropriate coordinate system (cartesian/polar)"""
-        global to_polar
         if self.polar :
             d, a = to_polar(p1, p2)
             return (round(d,5), round(a,5))
         else :
             return (round(p1, 5), round(p2, 5))
 
-    def force(self, other:PlanetObject) -> tuple[float,float]:
-        """Calculate the gravitiational force between this and another
-        instance of `PlanetObject`, or detect whether they are colliding 
-        (if the system allows).
-        Return the X, Y components of 2D force if it was found succesfully,
-        else return 0, 0 in case of an error or collision."""
-
-        r = math.hypot(self.x-other.x, self.y-other.y)
-        if self.system.collisions and \
-           r <= self.system.rf * (self.radius + other.radius) and \
-           not self.has_collided and not other.has_collided :
-            self.collide(other)
-            return (0, 0)
-        try :
-            signx = 1 if other.x > self.x else -1
-            _ax = signx*self.system.G*other.mass*math.fabs(self.x-other.x)/r**3
-            signy = 1 if other.y > self.y else -1
-            _ay = signy*self.system.G*other.mass*math.fabs(self.y-other.y)/r**3
-        except ZeroDivisionError :
-            Logger.warning(f'Simulation: objects {self.idx} and {other.idx} are overlapping !')
-            if self.vx-other.vx == 0 and self.vy-other.vy == 0:
-                Logger.warning('Simulation: Shifting the coinciding bodies to avoid overlap')
-                self.vx += 1
-                other.vy += 1
-            return (0, 0)
-        return (_ax, _ay)
-
     def update(self, dt:float) -> None:
-        """Calculate the net force on this body at this instant during the simulation, 
-        based on all other bodies in its `system`, and use that to increment its 
-        attributes like position, velocity, etc over a differentially small time 
-        interval `dt` (the system will call this using its `dt` attribute)"""
-        try :
-            net_ax, net_ay = 0, 0
-            for body in self.system.all:
-                if body is not self :
-                    _ax, _ay = self.force(body)
-                    net_ax += _ax
-                    net_ay += _ay
-            self.ax, self.ay = net_ax, net_ay
-            
-            if self.system.calc_num == 0 :
-                self.vx += dt/2 * self.ax
-                self.vy += dt/2 * self.ay
-            else :
-                self.vx += dt * self.ax
-                self.vy += dt * self.ay
-
-            if self.trail :
-                lx, ly = self.positions[-1]
-                if math.hypot(self.x-lx, self.y-ly) >= self.system.tpdist :
-                    self.positions.append((self.x, self.y))
-                    self.system.totalpts += 1
-                if self.trail >= 0 and len(self.positions) > self.trail :
-                    self.positions.pop(0)
-                    self.system.totalpts -= 1
-            self.x += dt * self.vx
-            self.y += dt * self.vy
-            if abs(self.x)>self.system.bound or abs(self.y)>self.system.bound:
-                self.system.all.remove(self)
-                self.system.runaway.append(self)
-                self.info.text = f"""    <{self.idx}>
-Mass : {self.mass}        Radius : {self.radius}
-Position {'(Dist, Angle)' if self.polar else '(X, Y)'} : {self._neatpos(self.x, self.y)}
-    <- Escaped ->"""
-                Logger.info(f'Simulation : Object {self.idx} has crossed the boundary')
-            self.info.text = str(self)
-        except OverflowError :
+        """Use the net acceleration `ax`, `ay` on this body at this instant during the
+        simulation (found by the `system` for all its bodies together, due to all the
+        others) to increment its attributes like position, velocity, etc over a 
+        differentially small time interval `dt` (the system will call this using its
+        `dt` attribute).
+        This is the first half of a velocity-Verlet step - the velocity is only 
+        incremented over `dt/2` here, the system completes it with the acceleration
+        at the new position."""
+        # Work on local copies of the attributes, and store them back once
+        system = self.system
+        x, y = self.x, self.y
+        vx = self.vx + dt/2 * self.ax
+        vy = self.vy + dt/2 * self.ay
+
+        if self.trail :
+            positions = self.positions
+            lx, ly = positions[-1]
+            if (x-lx)*(x-lx) + (y-ly)*(y-ly) >= system.tpdist2 :
+                if len(positions) != positions.maxlen :
+                    system.totalpts += 1
+                positions.append((x, y))
+        x += dt * vx
+        y += dt * vy
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        bound = system.bound
+        # Float arithmetic gives inf/nan instead of raising OverflowError, and a
+        # nan position would never compare greater than the bound
+        if not (math.isfinite(x) and math.isfinite(y)):
             Logger.warning(f'Simulation : Overflow encountered for object {self.idx}!')
-            self.system.all.remove(self)
-            self.system.runaway.append(self)
+            system.all.remove(self)
+            system.runaway.append(self)
             InfoDialog(title='Overflow Error',
                 message=f"The object at \n{str(self)}\nwas removed from the simulation.")
+        elif abs(x) > bound or abs(y) > bound:
+            system.all.remove(self)
+            system.runaway.append(self)
+            self._set_infotext(f"""    <{self.idx}>
+Mass : {self.mass}        Radius : {self.radius}
+Position {'(Dist, Angle)' if self.polar else '(X, Y)'} : {self._neatpos(self.x, self.y)}
+    <- Escaped ->""")
+            Logger.info(f'Simulation : Object {self.idx} has crossed the boundary')
 
     def collide(self, other:PlanetObject) -> PlanetObject:
         """When a collision is supposed to occur between this and another `PlanetObject`,
@@ -232,14 +260,14 @@ Position {'(Dist, Angle)' if self.polar else '(X, Y)'} : {self._neatpos(self.x,
         other.system.all.remove(other)
         self.system.collided.append(self)
         other.system.collided.append(other)
-        self.info.text = f"""    <{self.idx}>
+        self._set_infotext(f"""    <{self.idx}>
 Mass : {self.mass}        Radius : {self.radius}
 Position {'(r, '+chr(952)+')' if self.polar else '(X, Y)'} : {self._neatpos(self.x, self.y)}
-    <- Collided ->"""
-        other.info.text = f"""    <{other.idx}>
+    <- Collided ->""")
+        other._set_infotext(f"""    <{other.idx}>
 Mass : {other.mass}        Radius : {other.radius}
 Position {'(r, '+chr(952)+')' if other.polar else '(X, Y)'} : {other._neatpos(other.x, other.y)}
-    <- Collided ->"""
+    <- Collided ->""")
         Logger.info(f'Simulation : Objects {self.idx} and {other.idx} have collided')
         p = App.get_running_app().config.getboolean('obj', 'polar')
         return PlanetObject(self.system, new_m, new_x, new_y, new_vx, new_vy,
@@ -279,7 +307,7 @@ class GravSystem :
     def __init__(self, const_G:float=1, const_dt:float=0.01, bound:int=10000, 
                  f_calc:float=50, random:bool=False, autoradius:bool=True, 
                  r_const:float=3, collision:bool=True, rf:float=1, vf:float=1, 
-                 tpdist:int=1):
+                 tpdist:int=1, r_cut:float=0):
         self.G = const_G
         self.dt = const_dt
         self.bound = abs(bound)
@@ -291,6 +319,10 @@ class GravSystem :
         self.rf = rf
         self.vf = vf
         self.tpdist = tpdist
+        # Compared with squared distances, to avoid a square root for each body
+        self.tpdist2 = tpdist * tpdist if tpdist > 0 else 0
+        # Bodies farther apart than `r_cut` do not attract each other (0 to disable)
+        self.r_cut2 = r_cut * r_cut if r_cut > 0 else 0
 
         self.all = list()
         self.collided = list()
@@ -298,17 +330,86 @@ class GravSystem :
         self.totalpts = 0
         self.calc_num = 0
         self.simtime = 0.0
+        # Whether the `info` labels of the bodies are visible and must be kept updated,
+        # set by the `Simulator`
+        self.show_info = False
 
     def _add_obj(self, o:PlanetObject) -> None:
         """Add a body to the system. Do not call this directly, is is automatically
         done when creating the `PlanetObject`."""
         self.all.append(o)
 
+    def _collide_all(self) -> bool:
+        """Collide each pair of active bodies that are closer than `rf` times the sum
+        of their radii. A body can only collide once in each update.
+        Return whether any collision occurred."""
+        bodies = list(self.all)
+        n = len(bodies)
+        # Positions and scaled radii do not change during the loop, since bodies
+        # that collide are not checked again
+        xs = [p.x for p in bodies]
+        ys = [p.y for p in bodies]
+        rs = [self.rf * p.radius for p in bodies]
+        collided = False
+        for i in range(n):
+            a = bodies[i]
+            xi, yi, ri = xs[i], ys[i], rs[i]
+            for j in range(i+1, n):
+                if a.has_collided :
+                    break
+                b = bodies[j]
+                if b.has_collided :
+                    continue
+                dx = xi - xs[j]
+                dy = yi - ys[j]
+                t = ri + rs[j]
+                if dx*dx + dy*dy <= t*t :
+                    a.collide(b)
+                    collided = True
+        return collided
+
+    def _find_accelerations(self, bodies:list[PlanetObject]) -> None:
+        """Set the accelerations `ax`, `ay` of all the `bodies` together, from their
+        positions at this instant, as found by `_accelerations()` from flat lists
+        of their coordinates and masses. Push apart any that exactly coincide."""
+        axs, ays, overlaps = _accelerations([p.x for p in bodies], 
+                                            [p.y for p in bodies],
+                                            [p.mass for p in bodies], self.G,
+                                            self.r_cut2)
+        for i, j in overlaps :
+            a, b = bodies[i], bodies[j]
+            Logger.warning(f'Simulation: objects {a.idx} and {b.idx} are overlapping !')
+            if a.vx-b.vx == 0 and a.vy-b.vy == 0:
+                Logger.warning('Simulation: Shifting the coinciding bodies to avoid overlap')
+                a.vx += 1
+                b.vy += 1
+        for p, ax, ay in zip(bodies, axs, ays) :
+            p.ax, p.ay = ax, ay
+
     def update(self, delta:float) -> None:
         """Update the system, by incrementing the simulation time, and triggering
-        an update on all the active bodies."""
-        for p in self.all :
+        an update on all the active bodies.
+        Colliding bodies are merged first (if the system allows). The bodies are moved
+        by velocity-Verlet integration - each one's velocity is incremented over half
+        the interval with its current acceleration and it is moved (`PlanetObject.update`),
+        then the accelerations at the new positions complete the velocity increment.
+        These are kept for the first half of the next update, so the accelerations are
+        found only once per update unless the set of bodies has changed."""
+        collided = self.collisions and self._collide_all()
+        if collided or self.calc_num == 0 :
+            # The accelerations from the previous update are not valid (yet)
+            self._find_accelerations(list(self.all))
+        for p in list(self.all) :
             p.update(delta)
+        bodies = list(self.all)
+        self._find_accelerations(bodies)
+        half = delta / 2
+        for p in bodies :
+            p.vx += half * p.ax
+            p.vy += half * p.ay
+        if self.show_info :
+            for p in bodies :
+                p.info.text = str(p)
         self.calc_num += 1
         self.simtime += delta
 
@@ -387,10 +488,11 @@ class Simulator(BoxLayout):
     `self.system`. This is the system that will be simulated, it is created first
     and passed to `self.begin` by the app.
 
-    `calc_event` and `draw_event` are `kivy.clock.ClockEvent` s while the simulation
-    is active and playing, that repeatedly call the methods `self.calculate_loop()` to
-    update the system, and `self.graphic_loop()` to draw on/animate the GUI. They are
-    cancelled and set to `None` when the simulation is paused or ended.
+    `calc_event` is a `kivy.clock.ClockEvent` while the simulation is active and
+    playing, that repeatedly calls the method `self.calculate_loop()` to update the
+    system, which in turn calls `self.graphic_loop()` to draw on/animate the GUI
+    whenever the drawing interval has passed. It is cancelled and set to `None` when
+    the simulation is paused or ended.
     `self.scatter` is a `kivy.uix.scatter.ScatterPlane`, which manages all of the 
     translation/rotation/scaling itself, according to the state of its `transform` 
     matrix, which is manipulated here.
@@ -413,6 +515,10 @@ class Simulator(BoxLayout):
     viewer = ObjectProperty(None)
     ppbtn = ObjectProperty(None)
 
+    # Most system updates that `self.calculate_loop()` may run in one call to
+    # catch up, if the clock cannot call it as often as the calculation frequency
+    max_substeps = 10
+
     def __init__(self, **kwargs):
         super(Simulator, self).__init__(**kwargs)
         self.system = None
@@ -421,7 +527,13 @@ class Simulator(BoxLayout):
         self.interactions = dict([(a, False) for a in \
                                   ('l','u','d','r','zi','zo','tc','ta')])
         self.calc_event = None
-        self.draw_event = None
+        # Time since `self.graphic_loop()` was last called by `self.calculate_loop()`
+        self._drawdue = 0.
+        # Calculation intervals that have passed but not been simulated yet
+        self._calclag = 0.
+        # Drawing state of `self.graphic_loop()`, the canvas is re-drawn when it changes
+        self._drawkey = None
+        self._activeshapes = []
         self.details = BGLabel(size_hint=(None, None), bgcolour=[0.2,0.2,0.2,0.0],
                         width='250dp', height='350dp', color=[1,1,1,1],
                         markup=True, pos_hint={'top':1, 'left':0}, font_size='15sp',
@@ -433,13 +545,14 @@ class Simulator(BoxLayout):
         """Update the GUI when translated by touch/click-and-drag on the scatter.
         Bound to `self.scatter.on_transform_with touch` in the app `.kv` file."""
         if self.system is not None :
-            m = list(self.scatter.transform.get())
+            m = self.scatter.transform.get()
             self.xpos = round(self.viewer.width/2 - m[12], 4)
             self.ypos = round(self.viewer.height/2 + 1.5*self.simcontrols.height - m[13], 4)
             if self.infovis :
-                for p in self.system.all + self.system.collided + \
-                    self.system.runaway :
-                    p.info.pos = self.scatter.to_parent(p.x, p.y)
+                to_parent = self.scatter.to_parent
+                for p in chain(self.system.all, self.system.collided,
+                               self.system.runaway) :
+                    p.info.pos = to_parent(p.x, p.y)
 
     def begin(self, gravsystem:GravSystem) -> None:
         """Start simulating the system `gravsystem`. 
@@ -451,6 +564,7 @@ class Simulator(BoxLayout):
         Logger.info('Simulation : Beginning the simulation')
         self.active = True
         self.system = gravsystem
+        gravsystem.show_info = self.infovis
         self.bound = self.cnf.getint('sim', 'bound')
         self.space = Widget(size_hint=(None, None),
                             width = 2*self.bound + 1,
@@ -458,6 +572,7 @@ class Simulator(BoxLayout):
                             center=(0,0))
         self.scatter.clear_widgets()
         self.viewer.clear_widgets()
+        self._drawkey = None
         self.scatter.add_widget(self.space)
         self.viewer.add_widget(self.scatter)
         self.drawaxes = InstructionGroup()
@@ -513,10 +628,11 @@ class Simulator(BoxLayout):
         self.ppbtn.state = 'normal'
         self.paused = False
         
+        # Redraw on the first calculation after playing
+        self._drawdue = self.drawintv
+        self._calclag = 0.
         self.calc_event = Clock.schedule_interval(self.calculate_loop,
                                                   self.calcintv)
-        self.draw_event = Clock.schedule_interval(self.graphic_loop,
-                                                  self.drawintv)
         Logger.info(f"Simulation : Now Playing... Time={str(datetime.now())}, \
 Calc. Inter={self.calcintv}, Draw. inter={self.drawintv}")
 
@@ -526,15 +642,33 @@ Calc. Inter={self.calcintv}, Draw. inter={self.drawintv}")
         and `paused`=False.
         Trigger an update on `self.system` by passing its `dt` as time inetrval,
         or if `system.random`=True, randomise using the dt parameter given by the clock.
-        After updating, end the simulation if there are no objects left and also update
-        the GUI label `self.details`."""
-
+        The clock cannot call this more often than once per frame, so if more than one
+        calculation interval has passed, run up to `self.max_substeps` updates now to
+        keep the simulation speed set by the calculation frequency (the fractions of
+        an interval left over are carried to the next call).
+        After updating, end the simulation if there are no objects left, or else update
+        the GUI label `self.details`. Then redraw with `self.graphic_loop()` if the
+        drawing interval has passed, so both run from a single clock event (drawing
+        cannot be more frequent than the calculations)."""
+
+        ratio = dt / self.calcintv
         if self.system.random :
-            delta = dt/self.calcintv * self.system.dt
+            # The interval itself follows the clock, so no simulated time is lost
+            steps = min(max(1, round(ratio)), self.max_substeps)
+            delta = ratio / steps * self.system.dt
         else :
+            # Carry the fraction of an interval left over to the next call, so that
+            # the simulation does not drift behind; only updates beyond the limit
+            # of `self.max_substeps` are dropped
+            self._calclag += ratio
+            steps = min(round(self._calclag), self.max_substeps)
+            self._calclag = min(self._calclag - steps, 0.5)
             delta = self.system.dt
         try :
-            self.system.update(delta)
+            for _ in range(steps) :
+                self.system.update(delta)
+                if not self.system.all :
+                    break
         except Exception as err:
             Logger.warning('Simulation : Calculation error', exc_info=str(err))
         if len(self.system.all) == 0 :
@@ -542,6 +676,7 @@ Calc. Inter={self.calcintv}, Draw. inter={self.drawintv}")
             InfoDialog(title='Simulation ended',
                        message="No more active objects remaining !")
             self.stop()
+            return
         if self.infovis :
             self.details.text = f"""[size=28][b] Gravity Simulation [/b][/size]\n
 Calculations completed : {self.system.calc_num}
@@ -557,48 +692,80 @@ Looking at (X,Y) : {(self.xpos, self.ypos)}
 Scale : {str(round(self.scatter.scale*100, 2)) + ' %'}
 Rotation : {str(round(self.scatter.rotation, 1)) + ' °'}
 """        
+        self._drawdue += dt
+        if self._drawdue >= self.drawintv :
+            self._drawdue %= self.drawintv
+            self.graphic_loop(dt)
 
     def graphic_loop(self, dt:float=0.05,
                      usecanvas:Union[kivy.graphics.instructions.Canvas,
                                      kivy.graphics.Fbo, None]=None) -> None:
-        """This function is called repeatedly by the kivy Clock, while `active`=True
-        and `paused`=False.
+        """This function is called repeatedly by `self.calculate_loop()`, while 
+        `active`=True and `paused`=False.
         Draw all of the system's `PlanetObject` s and their trails on `self.space.canvas`
         (default, unless `usecanvas` is given - it must be a `kivy.graphics.Fbo` or
         `kivy.graphics.instructions.Canvas`). The dt parameter given by the clock is
         irrelevant here. 
+        The instructions on `self.space.canvas` are only re-created by `self._draw()`
+        when a body has collided or escaped, or the display settings have changed; 
+        otherwise just the trails and positions of the active bodies are updated.
         If `self.infovis`=True, also display each `PlanetObject.info` label at the
         appropriate position in `self.viewer`."""
 
-        base = usecanvas if usecanvas else self.space.canvas
+        system = self.system
+        key = (len(system.collided), len(system.runaway), tuple(self.bgc), self.axvis)
+        if usecanvas :
+            self._draw(usecanvas)
+            # The axes instructions have been moved to the other canvas
+            self._drawkey = None
+        elif key != self._drawkey :
+            self._activeshapes = self._draw(self.space.canvas)
+            self._drawkey = key
+        else :
+            for o, trail, body in self._activeshapes :
+                trail.points = o.positions
+                body.pos = (o.x-o.radius, o.y-o.radius)
+
+        if self.infovis :
+            to_parent = self.scatter.to_parent
+            for p in chain(system.collided, system.runaway):
+                p.info.pos = to_parent(p.x, p.y)
+                if p.info not in self.viewer.children :
+                    self.viewer.add_widget(p.info)
+            for o in system.all :
+                o.info.pos = tuple(map(int, to_parent(o.x, o.y)))
+                if o.info not in self.viewer.children :
+                    self.viewer.add_widget(o.info)
+
+    def _draw(self, base:Union[kivy.graphics.instructions.Canvas, kivy.graphics.Fbo]
+              ) -> list[tuple[PlanetObject, Line, Ellipse]]:
+        """Clear the canvas `base`, and draw the background, axes (if visible) and all
+        of the system's bodies and trails on it. Called by `self.graphic_loop()`.
+        Return a list of `(body, trail Line, Ellipse)` for each active body, whose
+        instructions can be updated as it moves."""
+        shapes = []
         base.clear()
         with base :
             Color(rgba=self.bgc)
-            bg = Rectangle(size=self.space.size, pos=self.space.pos)
+            Rectangle(size=self.space.size, pos=self.space.pos)
             if self.axvis :
                 base.add(self.drawaxes)
             
-            for p in self.system.collided + self.system.runaway:
+            for p in chain(self.system.collided, self.system.runaway):
                 Color(rgba=p.colour)
                 Line(points=p.positions)
                 Line(points=[p.x+5, p.y+5, p.x-5, p.y-5, p.x, p.y,
                              p.x-5, p.y+5, p.x+5, p.y-5], width=2)
-                if self.infovis :
-                    p.info.pos = self.scatter.to_parent(p.x, p.y)
-                    if p.info not in self.viewer.children :
-                        self.viewer.add_widget(p.info)
             for o in self.system.all :
                 Color(rgba=o.colour)
-                Line(points=o.positions)
-                Ellipse(size=(2*o.radius, 2*o.radius),
-                        pos=(o.x-o.radius, o.y-o.radius))
-                if self.infovis :
-                    o.info.pos = tuple(map(int, self.scatter.to_parent(o.x, o.y)))
-                    if o.info not in self.viewer.children :
-                        self.viewer.add_widget(o.info)
+                trail = Line(points=o.positions)
+                body = Ellipse(size=(2*o.radius, 2*o.radius),
+                               pos=(o.x-o.radius, o.y-o.radius))
+                shapes.append((o, trail, body))
+        return shapes
 
     def pause(self):
-        """Pause the simulation - cancel the calculate and draw eventloops,
+        """Pause the simulation - cancel the calculate and draw eventloop,
         but retain the system's data."""
         self.simstatetext = "Paused"
         self.simstatecolour = [0.8, 0.1, 0.1, 1]
@@ -606,9 +773,7 @@ Rotation : {str(round(self.scatter.rotation, 1)) + ' °'}
         self.ppbtn.state = 'down'
         if self.calc_event is not None :
             self.calc_event.cancel()
-        if self.draw_event is not None :
-            self.draw_event.cancel()
-        self.calc_event, self.draw_event = None, None
+        self.calc_event = None
         Logger.info(f'Simulation : Paused... Time={str(datetime.now())}')
         self.paused = True
 
@@ -627,8 +792,15 @@ Rotation : {str(round(self.scatter.rotation, 1)) + ' °'}
         If info should be hidden, remove all the Label widets from `self.viewer`,
         leaving only `self.scatter` as a child widget. If it needs to be shown,
         add back `self.details` (at a fixed position, the `PlanetObject.info` labels
-        are added in the next call to `self.graphic_loop()`)"""
+        are added in the next call to `self.graphic_loop()`)
+        The system only updates the text of the labels while they are shown, so
+        refresh those of the active bodies when showing them again."""
         self.infovis = True if state == 'down' else False
+        if self.system is not None :
+            self.system.show_info = self.infovis
+            if self.infovis :
+                for p in self.system.all :
+                    p.info.text = str(p)
         if not self.infovis :
             self.viewer.clear_widgets()
             self.viewer.add_widget(self.scatter)
@@ -638,16 +810,14 @@ Rotation : {str(round(self.scatter.rotation, 1)) + ' °'}
 
     def stop(self):
         """Stop the simulation. Similar to `self.pause()`, cancel the calculate
-        & draw eventloops; but also set `self.active` to False, so that none of the
+        & draw eventloop; but also set `self.active` to False, so that none of the
         controls continue to have any effect. Bound to the stop button in GUI from
         `.kv` file."""
         if self.active:
             Logger.info(f'Simulation : Stopping simulation {str(datetime.now())}')
         if self.calc_event is not None :
             self.calc_event.cancel()
-        if self.draw_event is not None :
-            self.draw_event.cancel()
-        self.calc_event, self.draw_event = None, None
+        self.calc_event = None
         self.active = False
         self.ppbtn.state = 'normal'
         self.simstatetext = "Not Running"
@@ -717,17 +887,19 @@ Rotation : {str(round(self.scatter.rotation, 1)) + ' °'}
     def delete(self):
         """Clear all drawings on `self.space.canvas`. If the simulation is playing,
         drawing will still continue from the next call to `self.graphic_loop()`.
-        Also erase all the points stored in each `PlanetObject.positions` list,
+        Also erase all the points stored in each `PlanetObject.positions` queue,
         so that the trail lines aren't re-drawn from the beginning in the next frame.
         Bound to the delete button in GUI from the `.kv` file"""
         if self.active and isinstance(self.space, Widget):
             self.space.canvas.clear()
-            for p in self.system.collided + self.system.runaway:
-                if len(p.positions) > 4:
-                    p.positions = p.positions[-4:]
-            for o in self.system.all:
-                if len(o.positions) > 4:
-                    o.positions = o.positions[-4:]
+            self._drawkey = None
+            for p in chain(self.system.collided, self.system.runaway, self.system.all):
+                positions = p.positions
+                if len(positions) > 4:
+                    # Indexing near either end of a deque is O(1), unlike copying it
+                    last = [positions[i] for i in range(-4, 0)]
+                    positions.clear()
+                    positions.extend(last)
 
     def screenshot(self):
         """Bound to the screenshot button in GUI from the `'kv` file. Depending on the
@@ -749,14 +921,24 @@ Rotation : {str(round(self.scatter.rotation, 1)) + ' °'}
         Called by `self.screenshot()`. If the app setting for "fullscreen" images is True,
         capture the entire `self.space`; else capture just the part visible in the window,
         clipped by `self.viewer`. Save the image in the directory `path` with the filename
-        (including extension `.png`) `fname`."""
+        (including extension `.png`) `fname`, or show an error if it cannot be written."""
         if self.cnf.getboolean('app','fullsc'):
             fbo = Fbo(size=self.space.size)
             self.graphic_loop(usecanvas=fbo)
+            # The Fbo is not part of any canvas, so render it once here; the Image
+            # only wraps its texture, the pixels are read when saving
+            fbo.draw()
             i = Image(fbo.texture)
         else:
             i = self.viewer.export_as_image()
-        i.save(os.path.join(path, fname))
+        target = os.path.join(path, fname)
+        try :
+            i.save(target)
+        except Exception as err:
+            Logger.error(f'Simulator : Cannot save screenshot to {target}',
+                exc_info=str(err))
+            InfoDialog(title='Error', message='The specified address {} is invalid'.format(
+                target))
 
 
 
@@ -770,14 +952,13 @@ class Calculators(BoxLayout):
     whenever the text content in it changes - `self.valueupdate()` is appended to all
     initially while defining the UI, and hence is triggered each time an input occurs.
     
-    Mathematical equation solving is done partially by explicit instructions
-    in `self.evaluate()`, and completed by `sympy` (reduces time compared
-    to letting `sympy.solve()` figure out all the 6-variable relationships by itself,
-    but still saves writing most of the 6-choose-3 permutations of formulas).
+    Mathematical equation solving is done by the explicit formulas in
+    `self._closedform()`, which handle every choice of `G` and 2 other known values
+    that `self.valueupdate()` accepts (any pair except both the velocities).
     
     If the system can be solved, automatically update the answers in the corresponding
     numeric fields. `self.symbolmap` and `self.symbolmap2` provide mappings from the
-    `sympy.Symbol` instance of a variable to the `NumEntry` widget, and vice-versa.
+    `NumEntry` widget to the name of its variable, and vice-versa.
     The relations of widgets and variables are created in `self.__init__()`, at which
     point the `ObjectProperty` references to the widgets may still be `None`.
     Hence they are also re-mapped in `self.valueupdate` if required."""
@@ -792,17 +973,13 @@ class Calculators(BoxLayout):
     def __init__(self, **kwargs):
         super(Calculators, self).__init__(**kwargs)
         self.params = [self.cf_M, self.cf_R, self.cf_T, self.cf_v_esc, self.cf_v_orb]
-        self.G,self.M,self.R,self.T,self.v_orb,self.v_esc = sympy.symbols('G M R T v_orb v_esc')
+        self.G,self.M,self.R,self.T,self.v_orb,self.v_esc = 'G','M','R','T','v_orb','v_esc'
 
         self.symbolmap = {self.cf_M:self.M, self.cf_R:self.R, self.cf_T:self.T,
             self.cf_v_orb:self.v_orb, self.cf_v_esc:self.v_esc}
         self.symbolmap2 = {self.M:self.cf_M, self.R:self.cf_R, self.T:self.cf_T,
             self.v_orb:self.cf_v_orb, self.v_esc:self.cf_v_esc}
 
-        self.eqn_TR = self.T**2 - (4*sympy.pi**2)/(self.G * self.M) * self.R**3
-        self.eqn_vo = self.v_orb - sympy.sqrt((self.G * self.M) / self.R)
-        self.eqn_ve = self.v_esc - sympy.sqrt((2*self.G * self.M) / self.R)
-
     def valueupdate(self, cf:NumEntry=None, text:str=None):
         """Check whether the calculator field `cf` contains a valid floating point
         value, and whether there is enough information to find all the other variables.
@@ -857,56 +1034,20 @@ class Calculators(BoxLayout):
         for p in self.params: 
             p.ontext_callbacks = [self.valueupdate]
 
-    def evaluate(self, to_find : Iterable[sympy.Symbol], 
-                       knowns : dict[sympy.Symbol, float]):
-        """Solve the system of equations given by `self.eqn_TR`, `self.eqn_vo` and
-        `self.eqn_ve`using 3 values in `knowns`, and substitute the values of the
-        remaining (`to_find`) in their corresponding GUI entries.
-        Attempt to find the values of `G`, `M`, and `R` in each case, and then use
-        these by substituting into the formulas.
+    def evaluate(self, to_find : Iterable[str], 
+                       knowns : dict[str, float]):
+        """Find the values of the variables in `to_find` from `G` and the 2 other
+        values in `knowns` using `self._closedform()`, and substitute them in their
+        corresponding GUI entries.
         
         This function is called by `self.valueupdate()` when safe and necessary. 
-        *Do not* call otherwise, since improper or undefined values of 
-        knowns/unknowns may cause sympy to 'hang', taking several minutes or 
-        indefinitely long to solve, while blocking the main thread / function call.
-        Updating the text values without unbinding `self.valueupdate` will also
-        cause infinite recursion."""
+        *Do not* call otherwise, since `knowns` must be one of the combinations
+        handled by `self._closedform()`, and updating the text values without
+        unbinding `self.valueupdate` will cause infinite recursion."""
         try :
-            unknowns = to_find[:]
-            eq_TR = self.eqn_TR.subs(knowns)
-            eq_vo = self.eqn_vo.subs(knowns)
-            eq_ve = self.eqn_ve.subs(knowns)
-            eqmap = {self.v_orb:eq_vo, self.v_esc:eq_ve, self.T:eq_TR}
-
-            # Find G,M,R
-            if self.M in unknowns and self.R in unknowns:
-                if self.v_orb in knowns:
-                    aa = sympy.solve([eq_TR, eq_vo], [self.M,self.R])
-                else :
-                    aa = sympy.solve([eq_TR, eq_ve], [self.M,self.R])
-                unknowns.pop(unknowns.index(self.M))
-                unknowns.pop(unknowns.index(self.R))
-                knowns[self.M] = math.fabs(aa[0][0])
-                knowns[self.R] = math.fabs(aa[0][1])
-            elif self.M in unknowns and self.R in knowns:
-                for v in knowns:
-                    if v in eqmap:
-                        m = sympy.solve(eqmap[v], self.M)
-                        break
-                unknowns.pop(unknowns.index(self.M))
-                knowns[self.M] = math.fabs(m[0])
-            elif self.R in unknowns and self.M in knowns:
-                for v in knowns:
-                    if v in eqmap:
-                        r = sympy.solve(eqmap[v], self.R)
-                        break
-                unknowns.pop(unknowns.index(self.R))
-                knowns[self.R] = math.fabs(r[0])
-            
-            # Solve the rest
-            for u in unknowns :
-                x = sympy.solve(eqmap[u].subs(knowns), u)
-                knowns[u] = math.fabs(x[0])
+            solved = self._closedform(knowns)
+            for u in to_find :
+                knowns[u] = solved[u]
             for x in knowns:
                 if math.fabs(knowns[x] - round(knowns[x])) < 0.00000000000001:
                     knowns[x] = round(knowns[x])
@@ -918,6 +1059,32 @@ class Calculators(BoxLayout):
             Logger.error(f"Calculators : Error occurred while calculating values for \
                 unknowns={to_find}, knowns={knowns}", exc_info=str(err))
 
+    def _closedform(self, knowns:dict[str, float]
+                    ) -> dict[str, float]:
+        """Find the values of all the variables from `knowns` (`G` and 2 others,
+        not both velocities) by explicit formulas - first `M` and `R`, then the rest
+        from these."""
+        G = knowns[self.G]
+        M, R, T = knowns.get(self.M), knowns.get(self.R), knowns.get(self.T)
+        vo = knowns.get(self.v_orb)
+        if vo is None and self.v_esc in knowns :
+            vo = knowns[self.v_esc] / math.sqrt(2)
+        if M is None and R is None :
+            M = vo**3 * T / (2*math.pi*G)
+            R = vo * T / (2*math.pi)
+        elif R is None :
+            if vo is not None :
+                R = G * M / vo**2
+            else :
+                R = (G * M * T**2 / (4*math.pi**2)) ** (1/3)
+        elif M is None :
+            if vo is not None :
+                M = R * vo**2 / G
+            else :
+                M = 4*math.pi**2 * R**3 / (G * T**2)
+        return {self.M: M, self.R: R, self.T: 2*math.pi*math.sqrt(R**3 / (G*M)),
+                self.v_orb: math.sqrt(G*M / R), self.v_esc: math.sqrt(2*G*M / R)}
+
     def clearinputs(self):
         """Erase the entered values of all the `NumEntry` inputs of the symbols.
         Bound to the 'Clear All' GUI button in the `.kv` file."""
@@ -965,6 +1132,7 @@ class GravityAppUI(BoxLayout):
 
     def __init__(self, **kwargs):
         super(GravityAppUI, self).__init__(**kwargs)
+        self.cnf = App.get_running_app().config
 
         self.templatemodels = []
         self.tmplbtn_defaulttext = u"[font=fonts/Iconize-Italic][size=30] c [/size]\
@@ -1013,7 +1181,7 @@ parameters here : "))
         The parsing and formatting of data in the `PlanetInput` instances is performed
         by `self.processinput()`. Settings are obtained from the app ConfigParser."""
 
-        cnf = App.get_running_app().config
+        cnf = self.cnf
         data = self.processinput()
         if data is not None :
             try :
@@ -1092,6 +1260,7 @@ loading the model data from file")
         """Load the planet data into the create panel by dynamically creating 
         `PlanetInput` instances and updating their values. Called by `self._finishimport()`"""
         try :
+            polar = self.cnf.getboolean('obj', 'polar')
             for obj in d :
                 w = PlanetInput()
                 w.setcolour(obj["colour"])
@@ -1099,7 +1268,7 @@ loading the model data from file")
                 w.radius.text = str(obj["radius"])
                 w.trail.value = int(obj["trail"]) // w.t_scale
                 x, y, vx, vy = obj['x'], obj['y'], obj['vx'], obj['vy']
-                if App.get_running_app().config.getboolean('obj', 'polar'):
+                if polar:
                     x, y = to_polar(x, y)
                     vx, vy = to_polar(vx, vy)
                 w.pos0.text, w.pos1.text = str(x), str(y)
@@ -1113,7 +1282,7 @@ loading the model data to the interface")
     def loadfilesetg(self, s:dict[str,Any]):
         """Change the current app settings to those specified in `s`.
         Called by `self._finishimport()`. See `self.savetofile()` for the dict format."""
-        cnf = App.get_running_app().config
+        cnf = self.cnf
         cnf.set('sim', 'const_G', s['G'])
         cnf.set('sim', 'const_dt', s['dt'])
         cnf.set('sim', 'bound', int(s['bound']))
@@ -1140,6 +1309,7 @@ loading the model data to the interface")
 
         objects = []  # List to be populated with the objects
         poss = {}     # Coordinates of the objects, to detect a clash (invalid)
+        polar = self.cnf.getboolean('obj', 'polar')
 
         for w in self.createarea.children :
             if isinstance(w, PlanetInput):
@@ -1173,7 +1343,7 @@ loading the model data to the interface")
                     x, y = float(w.pos0.text), float(w.pos1.text)
 
                     # Use the appropriate coordinate system
-                    if App.get_running_app().config.getboolean('obj', 'polar'):
+                    if polar:
                         x, y = to_cartesian(x, y)
                     p['x'], p['y'] = x, y
                     if (x,y) in poss.keys(): # Positions cannot clash
@@ -1193,7 +1363,7 @@ initial positions - Please change any coordinate(s) so that they don't coincide.
                     if not w.vel1.text:
                         w.vel1.text = '0'
                     vx, vy = float(w.vel0.text), float(w.vel1.text)
-                    if App.get_running_app().config.getint('obj', 'polar'):
+                    if polar:
                         vx, vy = to_cartesian(vx, vy)
                     p['vx'], p['vy'] = vx, vy
                 except ValueError :
@@ -1274,12 +1444,13 @@ velocity values have been converted from the old {then} ones wherever possible.'
         current settings; gets objects from `self.processinput()` and creates the
         `PlanetObject` instances for each, associated wih the `GravSystem`; and
         instructs the `Simulator` instance of the App to begin simulating the system."""
-        cnf = App.get_running_app().config
+        cnf = self.cnf
         gs = GravSystem(const_G = cnf.getfloat('sim', 'const_G'),
                         const_dt = cnf.getfloat('sim', 'const_dt'),
                         bound=cnf.getint('sim', 'bound'),
                         f_calc=cnf.getint('sim', 'f_calc'),
                         random=cnf.getboolean('sim', 'randomize'),
+                        r_cut=cnf.getfloat('sim', 'r_cut'),
                         autoradius=cnf.getboolean('obj', 'autoradius'),
                         r_const=cnf.getfloat('obj', 'r_const'),
                         collision=cnf.getboolean('collision', 'allow_collide'),
@@ -1346,7 +1517,7 @@ class GravityApp(App):
         if no existing `.ini` settings file is found in the app dir."""
         config.setdefaults('sim', {
             'const_G': 5, 'const_dt': 0.01, 'f_calc':50, 
-            'bound': 10000, 'randomize':int(False)})
+            'bound': 10000, 'randomize':int(False), 'r_cut': 0})
         config.setdefaults('obj', {
             'polar': int(False), 'autoradius':int(True), 'r_const': 3})
         config.setdefaults('collision', {
@@ -1390,6 +1561,9 @@ class GravityApp(App):
             if token == ('sim', 'f_calc'):
                 if float(val) < 0 or float(val) > maxfc:
                     self.correctsetting(config, sec, key, 50, msg=f'The calculation frequency must be between 0 and {maxfc}.')
+            if token == ('sim', 'r_cut'):
+                if float(val) < 0:
+                    self.correctsetting(config, sec, key, 0, msg='The interaction cutoff cannot be negative, use 0 to disable it.')
             if token == ('obj', 'polar'):
                 self.root.convertinput(val)
             if token == ('obj', 'autoradius'):